@@ -2,13 +2,11 @@
 # Streamlit GM Dashboard — auto-score on upload + PDF report generator
 import streamlit as st
 import pandas as pd
+import numpy as np
 import io
+import os
+import hashlib
 import datetime
-from reportlab.lib.pagesizes import A4
-from reportlab.pdfgen import canvas
-from reportlab.lib import colors
-from reportlab.platypus import Paragraph, Table, TableStyle, SimpleDocTemplate, Spacer
-from reportlab.lib.styles import getSampleStyleSheet
 
 # Optional password gate via Streamlit Secrets
 PASSWORD = st.secrets.get("GM_DASHBOARD_PASSWORD", None)
@@ -21,152 +19,197 @@ if PASSWORD:
 
 st.set_page_config(layout="wide", page_title="GM Dashboard - Lead Intelligence")
 st.title("GM Dashboard — Lead Intelligence")
-st.markdown("Upload a campaign CSV (raw or pre-scored). The app will auto-score raw uploads, persist the scored CSV, and let you generate a premium PDF report for the GM.")
+st.markdown("Upload a campaign CSV (raw or pre-scored). The app will auto-score raw uploads, persist the full scored dataset as Parquet, and let you generate a premium PDF report for the GM.")
 
 # ----------------------------
 # Scoring functions (MVP logic)
 # ----------------------------
+NUMERIC_COLS = ["last_seen_days", "searches_last_7d", "budget_min", "budget_max",
+                "project_keywords_matches", "viewed_mortgage_calc"]
+
+def coerce_numeric(df):
+    # One column-wise pass: blanks and junk become NaN, which each score treats as its default
+    present = [c for c in NUMERIC_COLS if c in df.columns]
+    if present:
+        df[present] = df[present].apply(pd.to_numeric, errors="coerce")
+    return df
+
+# Low-cardinality text columns stored as pandas categoricals to cut memory on big uploads
+CATEGORY_COLS = ["tag", "device", "location"]
+
+def to_categories(df):
+    for c in CATEGORY_COLS:
+        if c in df.columns:
+            df[c] = df[c].astype("category")
+    return df
+
+def _numeric_col(df, col, default=np.nan):
+    # Missing columns fall back to the same defaults the per-row lookups used
+    if col not in df.columns:
+        return pd.Series(default, index=df.index, dtype="float64")
+    return df[col]
+
+def _text_col(df, col):
+    if col not in df.columns:
+        return pd.Series("", index=df.index, dtype="object")
+    return df[col]
+
+def _as_float(values):
+    # Plain float64 with NaN for missing, whether the column is NumPy- or Arrow-backed
+    return values.to_numpy(dtype="float64", na_value=np.nan)
+
+def _ladder(values, bins, points, default, right=False):
+    # Branchless threshold ladder: np.digitize picks the bin, points[] maps it to a score
+    x = _as_float(values)
+    scored = np.asarray(points, dtype=np.int8)[np.digitize(x, bins, right=right)]
+    return np.where(np.isnan(x), np.int8(default), scored)
+
 def score_recency(days):
-    try:
-        days = int(days)
-    except:
-        return 0
-    if days <= 1:
-        return 20
-    if days <= 7:
-        return 15
-    if days <= 30:
-        return 10
-    return 0
+    # Bins start at 2/8/31 so fractional days truncate like the old int() coercion
+    return _ladder(days, [2, 8, 31], [20, 15, 10, 0], default=0)
 
 def score_frequency(n_searches_7d):
-    try:
-        n = int(n_searches_7d)
-    except:
-        return 5
-    if n >= 10:
-        return 20
-    if n >= 5:
-        return 15
-    if n >= 2:
-        return 10
-    return 5
+    return _ladder(n_searches_7d, [2, 5, 10], [5, 10, 15, 20], default=5)
 
 def score_budget(min_b, max_b):
-    try:
-        variance = float(max_b) - float(min_b)
-    except:
-        return 5
-    if variance <= 500000:
-        return 15
-    if variance <= 1000000:
-        return 10
-    return 5
+    return _ladder(max_b - min_b, [500000, 1000000], [15, 10, 5], default=5, right=True)
 
 def score_project_focus(matches):
-    try:
-        m = int(matches)
-    except:
-        return 0
-    if m >= 3:
-        return 15
-    if m == 2:
-        return 10
-    if m == 1:
-        return 5
-    return 0
-
-def score_cross_platform(platforms_str):
-    if pd.isna(platforms_str) or str(platforms_str).strip() == "":
-        return 5
-    platforms = [p.strip() for p in str(platforms_str).split(",") if p.strip()]
-    if len(platforms) >= 3:
-        return 20
-    if len(platforms) == 2:
-        return 15
-    return 5
+    return _ladder(matches, [1, 2, 3], [0, 5, 10, 15], default=0)
+
+def score_cross_platform(platforms):
+    # Count non-blank comma-separated entries without splitting row by row
+    n = platforms.fillna("").astype(str).str.count(r"[^,\s][^,]*")
+    return _ladder(n, [2, 3], [5, 15, 20], default=5)
 
 def score_engagement(viewed_mortgage):
-    try:
-        v = int(viewed_mortgage)
-    except:
-        return 5
-    return 10 if v == 1 else 5
-
-def device_bonus(device_str):
-    d = str(device_str).lower()
-    bonus = 0
-    if "iphone" in d or "ipad" in d or "ios" in d:
-        bonus += 3
-    if "macbook" in d or "desktop" in d or "windows" in d:
-        bonus += 5
-    if "android" in d:
-        bonus += 1
-    return bonus
-
-def compute_score_row(row):
-    r = score_recency(row.get("last_seen_days", "")) 
-    f = score_frequency(row.get("searches_last_7d", ""))
-    b = score_budget(row.get("budget_min", 0), row.get("budget_max", 0))
-    p = score_project_focus(row.get("project_keywords_matches", 0))
-    c = score_cross_platform(row.get("platforms", ""))
-    e = score_engagement(row.get("viewed_mortgage_calc", 0))
-    dev = device_bonus(row.get("device", ""))
-    raw_total = r + f + b + p + c + e + dev
-    score_val = min(round(raw_total), 100)
-    breakdown = {"recency": r, "frequency": f, "budget": b, "project_focus": p, "cross_platform": c, "engagement": e, "device_bonus": dev, "raw_total": raw_total}
-    return score_val, breakdown
-
-def tag_from_score(s):
-    if s >= 80:
-        return "Hot 🔥"
-    if s >= 60:
-        return "Warm"
-    return "Cold"
-
-def reasoning_and_action(row, score, breakdown):
-    reasons = []
-    if breakdown["recency"] >= 15:
-        reasons.append("recent activity")
-    if breakdown["frequency"] >= 15:
-        reasons.append("high frequency of searches")
-    if breakdown["project_focus"] >= 10:
-        reasons.append("project-specific interest")
-    if breakdown["cross_platform"] >= 15:
-        reasons.append("cross-platform engagement")
-    if breakdown["engagement"] >= 10:
-        reasons.append("engaged with mortgage/CTA")
-    if breakdown["device_bonus"] >= 3:
-        reasons.append("affluent device signal")
-    reason_text = ", ".join(reasons) if reasons else "activity recorded"
-    action = "Follow up with a personalized message and ROI details."
-    if score >= 85:
-        action = "Call immediately during buyer's evening hours; highlight payment plan and priority units."
-    elif score >= 70:
-        action = "Send WhatsApp with project brochure and ROI comparison; follow up with call in 24-48 hrs."
-    elif score >= 60:
-        action = "Send targeted email / WhatsApp with similar listings and financing options."
-    else:
-        action = "Add to nurture drip; retarget with video creatives."
+    return np.where(np.trunc(_as_float(viewed_mortgage)) == 1, np.int8(10), np.int8(5))
+
+def device_bonus(devices):
+    d = devices.fillna("").astype(str).str.lower()
+    bonus = (3 * d.str.contains("iphone|ipad|ios", regex=True)
+             + 5 * d.str.contains("macbook|desktop|windows", regex=True)
+             + 1 * d.str.contains("android", regex=False))
+    return bonus.to_numpy(dtype=np.int8)
+
+def compute_scores(df):
+    # Column-wise scoring: one pass per component instead of one Python call per row.
+    # Components are int8 (max 20 points) and are summed in place into one int32
+    # buffer, so the total costs no extra temporaries or a row-wise DataFrame.sum.
+    components = {
+        "recency": score_recency(_numeric_col(df, "last_seen_days")),
+        "frequency": score_frequency(_numeric_col(df, "searches_last_7d")),
+        "budget": score_budget(_numeric_col(df, "budget_min", 0), _numeric_col(df, "budget_max", 0)),
+        "project_focus": score_project_focus(_numeric_col(df, "project_keywords_matches", 0)),
+        "cross_platform": score_cross_platform(_text_col(df, "platforms")),
+        "engagement": score_engagement(_numeric_col(df, "viewed_mortgage_calc", 0)),
+        "device_bonus": device_bonus(_text_col(df, "device")),
+    }
+    raw_total = np.zeros(len(df), dtype=np.int32)
+    for points in components.values():
+        np.add(raw_total, points, out=raw_total)
+    breakdown = pd.DataFrame(components, index=df.index)
+    breakdown["raw_total"] = raw_total
+    scores = np.minimum(raw_total, 100)
+    return scores, breakdown
+
+def tag_from_score(scores):
+    return np.select([scores >= 80, scores >= 60], ["Hot 🔥", "Warm"], default="Cold")
+
+# (breakdown component, minimum points, reason shown to the GM)
+REASON_RULES = [
+    ("recency", 15, "recent activity"),
+    ("frequency", 15, "high frequency of searches"),
+    ("project_focus", 10, "project-specific interest"),
+    ("cross_platform", 15, "cross-platform engagement"),
+    ("engagement", 10, "engaged with mortgage/CTA"),
+    ("device_bonus", 3, "affluent device signal"),
+]
+
+def reasoning_and_action(scores, breakdown):
+    reasons = pd.Series("", index=breakdown.index, dtype="object")
+    for col, threshold, text in REASON_RULES:
+        reasons = reasons + np.where(breakdown[col] >= threshold, ", " + text, "")
+    reason_text = reasons.str[2:].replace("", "activity recorded")
+    action = np.select(
+        [scores >= 85, scores >= 70, scores >= 60],
+        [
+            "Call immediately during buyer's evening hours; highlight payment plan and priority units.",
+            "Send WhatsApp with project brochure and ROI comparison; follow up with call in 24-48 hrs.",
+            "Send targeted email / WhatsApp with similar listings and financing options.",
+        ],
+        default="Add to nurture drip; retarget with video creatives.",
+    )
     return reason_text, action
 
+# Area helpers are cached on the column contents, which st.cache_data hashes
+# cheaply, so reruns that don't change the data skip the string splitting.
+def _area_tokens(areas):
+    # One stripped, non-blank area/project tag per row (a lead's comma list is exploded)
+    parts = areas.dropna().astype(str).str.split(",").explode().str.strip()
+    return parts[parts != ""]
+
+@st.cache_data(show_spinner=False)
+def unique_areas(areas):
+    return sorted(_area_tokens(areas).unique().tolist())
+
+@st.cache_data(show_spinner=False)
+def area_distribution(areas):
+    # Lead counts per area/project tag, most frequent first
+    return _area_tokens(areas).value_counts()
+
+@st.cache_data(show_spinner=False)
+def make_display_df(leads):
+    # Leads table for the left column; cached on the filtered columns' contents
+    display_df = leads.copy()
+    budget_min = pd.to_numeric(display_df['budget_min'], errors='coerce').fillna(0).astype(np.int64).astype(str)
+    budget_max = pd.to_numeric(display_df['budget_max'], errors='coerce').fillna(0).astype(np.int64).astype(str)
+    display_df['budget'] = budget_min + ' - ' + budget_max
+    return display_df.rename(columns={'lead_id':'ID','name':'Name','location':'Location','areas':'Areas','device':'Device','platforms':'Platforms','score':'Score','tag':'Tag'})
+
+def apply_filters(df, min_score, area_filter, tag_filter):
+    filtered = df[df['score'].astype(int) >= min_score]
+    if area_filter:
+        # Exact area-token match: explode the comma lists, test membership, fold back per lead
+        area_tokens = filtered['areas'].fillna('').astype(str).str.split(',').explode().str.strip()
+        area_hits = area_tokens.isin(area_filter).groupby(level=0, sort=False).any()
+        filtered = filtered[area_hits.reindex(filtered.index, fill_value=False).to_numpy()]
+    if tag_filter:
+        filtered = filtered[filtered['tag'].isin(tag_filter)]
+    return filtered
+
 # ----------------------------
 # PDF Generation (in-memory)
 # ----------------------------
-def build_pdf_bytes(df, campaign_title="Campaign Intelligence Report"):
-    # Uses reportlab to create a polished PDF in memory
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=36, leftMargin=36, topMargin=36, bottomMargin=36)
+@st.cache_resource(show_spinner=False)
+def _pdf_env():
+    # ReportLab is only needed for the report, so import it and build the
+    # stylesheet once per server process instead of on every script rerun
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib import colors
+    from reportlab.platypus import Paragraph, Table, TableStyle, SimpleDocTemplate, Spacer
+    from reportlab.lib.styles import getSampleStyleSheet
     styles = getSampleStyleSheet()
+    styles["Title"].textColor = colors.HexColor("#0ea5a4")
+    return {"A4": A4, "colors": colors, "styles": styles, "Paragraph": Paragraph, "Table": Table,
+            "TableStyle": TableStyle, "SimpleDocTemplate": SimpleDocTemplate, "Spacer": Spacer}
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def build_pdf_bytes(df, campaign_title="Campaign Intelligence Report", generated_at=""):
+    # Uses reportlab to create a polished PDF in memory.
+    # Cached per (top-N frame, title, generated_at); st.cache_data hashes the frame's contents.
+    # generated_at is passed in (minute resolution) so repeat clicks within a minute hit the cache.
+    env = _pdf_env()
+    colors, styles = env["colors"], env["styles"]
+    Paragraph, Table, TableStyle, Spacer = env["Paragraph"], env["Table"], env["TableStyle"], env["Spacer"]
+    buffer = io.BytesIO()
+    doc = env["SimpleDocTemplate"](buffer, pagesize=env["A4"], rightMargin=36, leftMargin=36, topMargin=36, bottomMargin=36)
     story = []
 
-    title_style = styles["Title"]
-    title_style.textColor = colors.HexColor("#0ea5a4")
-    story.append(Paragraph(campaign_title, title_style))
+    story.append(Paragraph(campaign_title, styles["Title"]))
     story.append(Spacer(1, 12))
 
-    now = datetime.datetime.utcnow().strftime("%Y-%m-%d %H:%M UTC")
-    story.append(Paragraph(f"<b>Generated:</b> {now}", styles["Normal"]))
+    story.append(Paragraph(f"<b>Generated:</b> {generated_at}", styles["Normal"]))
     story.append(Spacer(1, 12))
 
     # Summary: top-level counts
@@ -181,16 +224,8 @@ def build_pdf_bytes(df, campaign_title="Campaign Intelligence Report"):
     # Top project/area breakdown
     story.append(Paragraph("<b>Top Projects / Areas</b>", styles["Heading3"]))
     # compute distribution
-    dist = {}
-    for a in df['areas'].dropna():
-        for part in str(a).split(','):
-            k = part.strip()
-            if not k:
-                continue
-            dist[k] = dist.get(k, 0) + 1
-    dist_rows = [["Project/Area", "Leads"]]
-    for k, v in sorted(dist.items(), key=lambda x: x[1], reverse=True):
-        dist_rows.append([k, str(v)])
+    dist = area_distribution(df['areas'])
+    dist_rows = [["Project/Area", "Leads"]] + [[k, str(v)] for k, v in dist.items()]
     if len(dist_rows) == 1:
         dist_rows.append(["(no project tags found)", "0"])
     tbl = Table(dist_rows, hAlign="LEFT")
@@ -221,7 +256,7 @@ def build_pdf_bytes(df, campaign_title="Campaign Intelligence Report"):
     # Add a small top-N leads table (ID, Name, Location, Score, Tag, Next Action)
     story.append(Paragraph("<b>Top leads (by score)</b>", styles["Heading3"]))
     topn = df.sort_values("score", ascending=False).head(15)[["lead_id","name","location","score","tag","next_action"]]
-    table_rows = [["ID","Name","Location","Score","Tag","Next Action"]] + topn.fillna("").values.tolist()
+    table_rows = [["ID","Name","Location","Score","Tag","Next Action"]] + topn.astype(object).fillna("").astype(str).to_numpy().tolist()
     tbl2 = Table(table_rows, colWidths=[50,120,90,40,60,150])
     tbl2.setStyle(TableStyle([
         ("BACKGROUND", (0,0), (-1,0), colors.HexColor("#0ea5a4")),
@@ -240,51 +275,99 @@ def build_pdf_bytes(df, campaign_title="Campaign Intelligence Report"):
 # ----------------------------
 # Upload / Load / Score logic
 # ----------------------------
-uploaded = st.file_uploader("Upload raw campaign CSV or a pre-scored scored_leads_output.csv (drag & drop)", type=["csv"])
+# Scored leads are persisted as Parquet; the CSV path is still read for older saves
+SCORED_PARQUET_PATH = "scored_leads_output.parquet"
+SCORED_PATH = "scored_leads_output.csv"
+
+def read_leads_csv(source):
+    # The pyarrow engine parses large campaign exports several times faster and
+    # yields Arrow-backed columns. Fall back to the C engine when pyarrow is absent
+    # or rejects the file (ParserError / ArrowInvalid are ValueErrors), e.g. on
+    # short rows that the C engine pads with NaN.
+    try:
+        df = pd.read_csv(source, engine="pyarrow", dtype_backend="pyarrow")
+    except (ImportError, ValueError):
+        if hasattr(source, "seek"):
+            source.seek(0)
+        return pd.read_csv(source)
+    # An all-blank (or header-only) column comes back as null[pyarrow], which rejects
+    # fillna(""), arithmetic and categorical conversion; retype it as an empty
+    # float column for the numeric scoring inputs and an empty string column otherwise
+    null_cols = [c for c, dtype in df.dtypes.items() if str(dtype) == "null[pyarrow]"]
+    for c in null_cols:
+        df[c] = df[c].astype("double[pyarrow]" if c in NUMERIC_COLS else "string[pyarrow]")
+    return df
+
+@st.cache_data(show_spinner=False)
+def load_and_score(upload_key, _file_bytes):
+    # Cached on the upload's SHA-1 (the leading underscore keeps st.cache_data from
+    # hashing the bytes again), so filter/slider reruns skip parsing and scoring
+    df = coerce_numeric(read_leads_csv(io.BytesIO(_file_bytes)))
+    # If the uploaded file already has a 'score' column, assume it's pre-scored
+    prescored = 'score' in df.columns
+    if not prescored:
+        scores, breakdown = compute_scores(df)
+        reasons, actions = reasoning_and_action(scores, breakdown)
+        # Attach all output columns in one step from whole arrays
+        df = df.assign(score=scores, tag=tag_from_score(scores), reasoning=reasons, next_action=actions)
+    return to_categories(df), prescored
+
+@st.cache_data(max_entries=2, show_spinner=False)
+def load_scored_from_disk(path, mtime):
+    # mtime is only part of the cache key: a re-saved file gets re-read. Kept in
+    # memory and bounded, since each save adds a key and the Parquet file already
+    # loads quickly on a cold start.
+    if path.endswith(".parquet"):
+        return to_categories(pd.read_parquet(path))
+    return to_categories(coerce_numeric(read_leads_csv(path)))
+
+def save_scored_to_disk(df):
+    # Parquet keeps dtypes and loads much faster than re-parsing CSV (pyarrow is a requirement)
+    df.to_parquet(SCORED_PARQUET_PATH, engine="pyarrow", compression="zstd", index=False)
+
+uploaded = st.file_uploader("Upload raw campaign CSV or a pre-scored CSV, e.g. one exported via \"Download filtered CSV\" (drag & drop)", type=["csv"])
 df = pd.DataFrame()
+data_key = None  # identifies the loaded dataset across reruns
 
 if uploaded is not None:
     try:
-        df = pd.read_csv(uploaded)
+        file_bytes = uploaded.getvalue()
+        # Hash the upload once per rerun; the digest keys scoring, persistence and filters
+        upload_key = hashlib.sha1(file_bytes).hexdigest()
+        df, prescored = load_and_score(upload_key, file_bytes)
+        data_key = ("upload", upload_key)
     except Exception as e:
         st.error(f"Could not read uploaded CSV: {e}")
         st.stop()
 
-    # If the uploaded file already has a 'score' column, assume it's pre-scored
-    if 'score' in df.columns:
+    if prescored:
         st.success("Uploaded file already contains scores — using uploaded scored file.")
     else:
-        # Auto-score each row
-        st.info("Uploaded file detected as RAW. Scoring leads now...")
-        scored_records = []
-        for _, row in df.iterrows():
-            # ensure keys exist
-            r = row.to_dict()
-            sc, breakdown = compute_score_row(r)
-            tag = tag_from_score(sc)
-            reason_text, action_text = reasoning_and_action(r, sc, breakdown)
-            r['score'] = sc
-            r['tag'] = tag
-            r['reasoning'] = reason_text
-            r['next_action'] = action_text
-            scored_records.append(r)
-        df = pd.DataFrame(scored_records)
+        st.info("Uploaded file detected as RAW. Scored all leads.")
         st.success("Scoring complete.")
 
-    # Persist the scored CSV to disk (app directory)
-    try:
-        df.to_csv("scored_leads_output.csv", index=False)
-        st.info("Scored leads saved to scored_leads_output.csv in app directory.")
-    except Exception as e:
-        st.warning(f"Could not save scored CSV to disk: {e}")
+    # Persist the scored leads to disk (app directory), once per distinct upload
+    if st.session_state.get("persisted_upload") != upload_key:
+        try:
+            save_scored_to_disk(df)
+            st.session_state["persisted_upload"] = upload_key
+            st.info(f"Scored leads saved to {SCORED_PARQUET_PATH} in app directory.")
+        except Exception as e:
+            st.warning(f"Could not save scored leads to disk: {e}")
 
 else:
-    # No upload provided: attempt to load existing scored file in app dir
-    try:
-        df = pd.read_csv("scored_leads_output.csv")
-        st.info("Loaded existing scored_leads_output.csv from app directory.")
-    except Exception:
-        df = pd.DataFrame()
+    # No upload provided: attempt to load existing scored file in app dir (Parquet first, then legacy CSV)
+    for path in (SCORED_PARQUET_PATH, SCORED_PATH):
+        if not os.path.exists(path):
+            continue
+        try:
+            mtime = os.path.getmtime(path)
+            df = load_scored_from_disk(path, mtime)
+            data_key = ("disk", path, mtime)
+            st.info(f"Loaded existing {path} from app directory.")
+            break
+        except Exception:
+            df = pd.DataFrame()
 
 if df.empty:
     st.warning("No scored leads found. Upload a scored CSV or a raw campaign CSV to start.")
@@ -301,17 +384,19 @@ for c in expected_cols:
 # Sidebar: filtering + export selections
 st.sidebar.header("Filters & Export")
 min_score = int(st.sidebar.slider("Min Score", 0, 100, 60))
-all_areas = sorted({a.strip() for ar in df['areas'].dropna() for a in str(ar).split(',') if a.strip()})
+all_areas = unique_areas(df['areas'])
 area_filter = st.sidebar.multiselect("Areas / Projects", options=all_areas, default=None)
-tag_filter = st.sidebar.multiselect("Tags", options=sorted(df['tag'].unique()), default=None)
+tag_filter = st.sidebar.multiselect("Tags", options=sorted(df['tag'].astype("category").cat.categories), default=None)
 top_n = int(st.sidebar.selectbox("Top N leads for package/report", options=[10,25,50,100], index=1))
 campaign_title = st.sidebar.text_input("Campaign / Report title", value="Off-Plan Campaign Intelligence")
 
-filtered = df[df['score'].astype(int) >= min_score]
-if area_filter:
-    filtered = filtered[filtered['areas'].apply(lambda x: any(a in str(x) for a in area_filter))]
-if tag_filter:
-    filtered = filtered[filtered['tag'].isin(tag_filter)]
+# Re-run the filter chain only when the dataset or a filter value actually changed;
+# other widget interactions (lead selection, title, Top N) reuse the stored frame
+filter_key = (data_key, min_score, tuple(sorted(area_filter or [])), tuple(sorted(tag_filter or [])))
+if st.session_state.get("filter_key") != filter_key:
+    st.session_state["filtered"] = apply_filters(df, min_score, area_filter, tag_filter)
+    st.session_state["filter_key"] = filter_key
+filtered = st.session_state["filtered"]
 
 st.write(f"Showing {len(filtered)} leads (filtered)")
 
@@ -320,19 +405,17 @@ left_col, right_col = st.columns([1.2, 1])
 
 with left_col:
     st.subheader("Leads")
-    display_df = filtered[['lead_id','name','location','areas','budget_min','budget_max','device','platforms','score','tag']].copy()
-    display_df['budget'] = display_df['budget_min'].fillna(0).astype(int).astype(str) + ' - ' + display_df['budget_max'].fillna(0).astype(int).astype(str)
-    display_df = display_df.rename(columns={'lead_id':'ID','name':'Name','location':'Location','areas':'Areas','device':'Device','platforms':'Platforms','score':'Score','tag':'Tag'})
+    display_df = make_display_df(filtered[['lead_id','name','location','areas','budget_min','budget_max','device','platforms','score','tag']])
     st.dataframe(display_df[['ID','Name','Location','Areas','budget','Device','Platforms','Score','Tag']], height=480)
 
-    # Save scored CSV button (persist current filtered selection)
+    # Download the filtered selection as CSV; the Save button persists the full scored dataset as Parquet
     csv_bytes = filtered.to_csv(index=False).encode('utf-8')
     st.download_button("📥 Download filtered CSV", data=csv_bytes, file_name="scored_leads_export.csv", mime="text/csv")
-    if st.button("💾 Save current scored CSV to app directory (scored_leads_output.csv)"):
+    if st.button(f"💾 Save current scored leads to app directory ({SCORED_PARQUET_PATH})"):
         try:
             # overwrite full scored file with filtered or full df? we save the full scored df to keep all leads
-            df.to_csv("scored_leads_output.csv", index=False)
-            st.success("Saved scored_leads_output.csv to app directory.")
+            save_scored_to_disk(df)
+            st.success(f"Saved {SCORED_PARQUET_PATH} to app directory.")
         except Exception as e:
             st.error(f"Could not save to disk: {e}")
 
@@ -363,15 +446,9 @@ with right_col:
 
     st.markdown("---")
     st.markdown("**Suggested Distribution (by Area/Project)**")
-    dist = {}
-    for a in filtered['areas'].dropna():
-        for part in str(a).split(','):
-            k = part.strip()
-            if not k:
-                continue
-            dist[k] = dist.get(k,0) + 1
-    if dist:
-        dist_df = pd.DataFrame([{'Area':k,'Leads':v} for k,v in dist.items()]).sort_values('Leads', ascending=False)
+    dist = area_distribution(filtered['areas'])
+    if not dist.empty:
+        dist_df = dist.rename_axis('Area').reset_index(name='Leads')
         st.table(dist_df)
     else:
         st.info("No area/project tags found in filtered leads.")
@@ -388,9 +465,9 @@ with right_col:
             st.warning("No leads in the current filtered set to include in report.")
         else:
             try:
-                pdf_bytes = build_pdf_bytes(top_frame, campaign_title)
-                ts = datetime.datetime.utcnow().strftime("%Y%m%d_%H%M")
-                filename = f"GM_Report_{ts}.pdf"
+                now = datetime.datetime.now(datetime.timezone.utc)
+                pdf_bytes = build_pdf_bytes(top_frame, campaign_title, now.strftime("%Y-%m-%d %H:%M UTC"))
+                filename = f"GM_Report_{now:%Y%m%d_%H%M}.pdf"
                 st.download_button("⬇️ Download PDF Report", data=pdf_bytes, file_name=filename, mime="application/pdf")
             except Exception as e:
                 st.error(f"Could not generate PDF: {e}")